@@ -106,6 +106,9 @@ def processar_dados_educacionais(path_xlsx, arquivo_saida="dados_educacionais.cs
 
     colunas_interesse = {
         'ID_MUNICIPIO': 'CO_MUNICIPIO',
+        'NU_ANO_CENSO': 'NU_ANO_CENSO',
+        'NO_REGIAO': 'NO_REGIAO',
+        'SG_UF': 'SG_UF',
         'TX_APROVACAO_5ANO': 'APR_5ANO',
         'TX_REPROVACAO_5ANO': 'REP_5ANO',
         'TX_ABANDONO_5ANO': 'ABA_5ANO',
@@ -120,8 +123,12 @@ def processar_dados_educacionais(path_xlsx, arquivo_saida="dados_educacionais.cs
     print("Limpando e normalizando dados...")
     df_resultado['ID_MUNICIPIO'] = df_resultado['ID_MUNICIPIO'].astype(str).str.replace(r'\.0$', '', regex=True).str.zfill(7)
 
+    # Colunas de segmentação (ano, região e UF) não são taxas
+    colunas_segmento = ['ID_MUNICIPIO', 'NU_ANO_CENSO', 'NO_REGIAO', 'SG_UF']
+    df_resultado['NU_ANO_CENSO'] = pd.to_numeric(df_resultado['NU_ANO_CENSO'], errors='coerce').astype('Int64')
+
     for col in df_resultado.columns:
-        if col != 'ID_MUNICIPIO':
+        if col not in colunas_segmento:
             # Converte para numérico, tratando '--' como nulo, e divide por 100
             df_resultado[col] = pd.to_numeric(df_resultado[col], errors='coerce') / 100
             df_resultado[col] = df_resultado[col].round(3)
@@ -72,7 +72,7 @@ def main():
 
     # Reordenar colunas para melhor visualização
     colunas_ordenadas = [
-        'ID_MUNICIPIO', 'PARTIDO',
+        'ID_MUNICIPIO', 'NU_ANO_CENSO', 'NO_REGIAO', 'SG_UF', 'PARTIDO',
         'TX_APROVACAO_5ANO', 'TX_REPROVACAO_5ANO', 'TX_ABANDONO_5ANO',
         'TX_APROVACAO_9ANO', 'TX_REPROVACAO_9ANO', 'TX_ABANDONO_9ANO'
     ]
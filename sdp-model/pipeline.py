@@ -1,11 +1,19 @@
 import pandas as pd
+import numpy as np
 import pickle
 import logging
 import sys
 import json
+import argparse
+import copy
+from itertools import combinations
 from pathlib import Path
 
-from sklearn.model_selection import train_test_split, StratifiedKFold, GridSearchCV
+from joblib import Parallel, delayed
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.inspection import partial_dependence
+from sklearn.model_selection import train_test_split, StratifiedKFold, GridSearchCV, cross_val_predict
 from sklearn.preprocessing import OneHotEncoder
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
@@ -15,26 +23,145 @@ from sklearn.metrics import roc_auc_score, f1_score, accuracy_score, precision_s
 from imblearn.over_sampling import SMOTE
 from imblearn.pipeline import Pipeline as ImbPipeline
 
+FEATURES = ['PARTIDO', 'TX_APROVACAO_5ANO', 'TX_REPROVACAO_5ANO', 'TX_ABANDONO_5ANO']
+
+# Níveis de segmentação, do mais específico ao mais geral. O serviço roteia cada
+# requisição para o primeiro nível em que houver um modelo para o segmento.
+SEGMENT_LEVELS = [
+    ['SG_UF', 'NU_ANO_CENSO'],
+    ['NO_REGIAO', 'NU_ANO_CENSO'],
+]
+
+# Segmentos com menos registros que isso usam o modelo nacional
+MIN_SEGMENT_SIZE = 50
+
+# Parâmetros da interpretabilidade (importância por permutação e dependência parcial)
+PERMUTATION_REPEATS = 10
+PDP_GRID_RESOLUTION = 20
+
+# Treinamento incremental: partições por ano do censo, com o holdout fixo em cache
+PARTITION_COLUMN = 'NU_ANO_CENSO'
+MODEL_DIR = Path(__file__).parent
+CACHE_DIR = MODEL_DIR / "cache"
+# Queda máxima de ROC AUC no holdout fixo aceita para promover o modelo atualizado
+PROMOTION_TOLERANCE = 0.005
+# Número mínimo de árvores adicionadas a cada atualização de um RandomForest
+MIN_NEW_TREES = 10
+
 def load_dataset(dataset_path):
     """Carrega o dataset a partir do caminho fornecido."""
     print(f"Carregando dataset de '{dataset_path}'...")
     return pd.read_csv(dataset_path)
 
-def save_artifacts(model, preprocessor, results, model_name="champion_model"):
+def build_inference_pipeline(model):
+    """
+    Monta um Pipeline do scikit-learn apenas com as etapas usadas na predição.
+
+    O SMOTE só atua no `fit`; removendo-o, o artefato resultante pode ser
+    carregado pelo serviço sem importar o imblearn.
+    """
+    steps = [(name, step) for name, step in model.steps if not hasattr(step, 'fit_resample')]
+    return Pipeline(steps=steps)
+
+def save_artifacts(model, preprocessor, results, model_name="champion_model", model_dir=MODEL_DIR):
     """Salva o modelo, o pré-processador e os resultados do benchmark."""
-    model_dir = Path(__file__).parent
+    model_dir = Path(model_dir)
     
     # Salvar modelo e pré-processador
     with open(model_dir / f"{model_name}.pkl", "wb") as f:
         pickle.dump(model, f)
     with open(model_dir / "preprocessor.pkl", "wb") as f:
         pickle.dump(preprocessor, f)
+
+    # Salvar versão de inferência (sem dependência do imblearn)
+    with open(model_dir / "inference_model.pkl", "wb") as f:
+        pickle.dump(build_inference_pipeline(model), f, protocol=pickle.HIGHEST_PROTOCOL)
         
     # Salvar resultados do benchmark
     with open(model_dir / "model_results.json", "w") as f:
         json.dump(results, f, indent=2)
         
-    print(f"Artefatos salvos em '{model_dir}': '{model_name}.pkl', 'preprocessor.pkl', 'model_results.json'.")
+    print(f"Artefatos salvos em '{model_dir}': '{model_name}.pkl', 'preprocessor.pkl', 'inference_model.pkl', 'model_results.json'.")
+
+def permutation_task(model, X, y, feature, baseline, n_repeats):
+    """Quedas de ROC AUC ao embaralhar uma feature, uma por repetição."""
+    values = X[feature].to_numpy()
+    # O X recebido é somente leitura (mapeado em memória); a cópia é feita uma vez por feature
+    X = X.copy()
+    drops = []
+    for repeat in range(n_repeats):
+        rng = np.random.default_rng([42, repeat])
+        X[feature] = values[rng.permutation(len(X))]
+        drops.append(baseline - roc_auc_score(y, model.predict_proba(X)[:, 1]))
+    return feature, drops
+
+def partial_dependence_task(model, X, features):
+    """Grade de dependência parcial 1-D ou 2-D para as features informadas."""
+    result = partial_dependence(
+        model, X, features, categorical_features=['PARTIDO'],
+        grid_resolution=PDP_GRID_RESOLUTION, kind='average'
+    )
+    return {
+        'features': list(features),
+        'grid': [values.tolist() for values in result['grid_values']],
+        'average': result['average'][0].tolist(),
+    }
+
+def compute_interpretability(model, X, y, n_jobs=-1):
+    """
+    Calcula, no conjunto de teste, a importância por permutação (ROC AUC) e as grades
+    de dependência parcial 1-D e 2-D de todas as features, para qualquer modelo.
+
+    Cada feature (com todas as suas repetições) e cada grade é uma tarefa de um pool
+    de processos, de modo que o modelo é serializado uma vez por tarefa. Com
+    `max_nbytes=0`, o joblib grava em disco os arrays numéricos (as taxas do X e o y)
+    e os mapeia em memória, somente leitura, nos processos, em vez de copiá-los.
+    """
+    print("Calculando importância por permutação e dependência parcial...")
+    y = np.asarray(y)
+    baseline = roc_auc_score(y, model.predict_proba(X)[:, 1])
+
+    with Parallel(n_jobs=n_jobs, max_nbytes=0) as parallel:
+        drops = dict(parallel(
+            delayed(permutation_task)(model, X, y, feature, baseline, PERMUTATION_REPEATS)
+            for feature in FEATURES
+        ))
+        grids = parallel(
+            delayed(partial_dependence_task)(model, X, features)
+            for features in [[f] for f in FEATURES] + [list(p) for p in combinations(FEATURES, 2)]
+        )
+
+    permutation_importance = {}
+    for feature in FEATURES:
+        scores = drops[feature]
+        permutation_importance[feature] = {
+            'mean': float(np.mean(scores)),
+            'std': float(np.std(scores)),
+            'scores': [float(score) for score in scores],
+        }
+
+    return {
+        'permutation_importance': {
+            'scoring': 'roc_auc',
+            'baseline_score': float(baseline),
+            'n_repeats': PERMUTATION_REPEATS,
+            'features': permutation_importance,
+        },
+        'partial_dependence': {
+            '1d': [grid for grid in grids if len(grid['features']) == 1],
+            '2d': [grid for grid in grids if len(grid['features']) == 2],
+        },
+    }
+
+def impurity_importances(model):
+    """Importâncias por impureza do RandomForest (None para outros modelos)."""
+    classifier = model.named_steps['classifier']
+    if not isinstance(classifier, RandomForestClassifier):
+        return None
+    # Obter nomes das features após o one-hot encoding
+    ohe_feature_names = model.named_steps['preprocessor'].named_transformers_['cat'].get_feature_names_out(['PARTIDO'])
+    all_feature_names = list(ohe_feature_names) + FEATURES[1:]
+    return dict(zip(all_feature_names, classifier.feature_importances_))
 
 def run_experiment(X, y, preprocessor):
     """Executa o benchmark entre os modelos para encontrar o campeão."""
@@ -86,32 +213,322 @@ def run_experiment(X, y, preprocessor):
     champion_pipeline.fit(X_train, y_train)
     
     # Extrair feature importances se for RandomForest
-    feature_importances = None
-    if best_model_name == 'RandomForest':
-        # Obter nomes das features após o one-hot encoding
-        ohe_feature_names = champion_pipeline.named_steps['preprocessor'].named_transformers_['cat'].get_feature_names_out(X.select_dtypes(include=['object']).columns)
-        all_feature_names = list(ohe_feature_names) + list(X.select_dtypes(exclude=['object']).columns)
-        
-        importances = champion_pipeline.named_steps['classifier'].feature_importances_
-        feature_importances = dict(zip(all_feature_names, importances))
+    feature_importances = impurity_importances(champion_pipeline)
+
+    # Importância por permutação e dependência parcial valem para qualquer campeão
+    interpretability = compute_interpretability(champion_pipeline, X_test, y_test)
 
     final_results = {
         "champion_model": best_model_name,
         "benchmark": benchmark_results,
-        "feature_importances": feature_importances
+        "feature_importances": feature_importances,
+        **interpretability
     }
     
-    return champion_pipeline, preprocessor, final_results
+    return champion_pipeline, preprocessor, final_results, X_test.index
+
+def segment_key(columns, values):
+    """Monta a chave de um segmento, ex.: 'SG_UF=CE__NU_ANO_CENSO=2023'."""
+    return "__".join(f"{column}={value}" for column, value in zip(columns, values))
+
+def smote_neighbors(n_minority):
+    """Número de vizinhos do SMOTE compatível com o tamanho da classe minoritária."""
+    return max(1, min(5, int(n_minority) - 1))
+
+def national_oof_proba(df, champion_model, n_jobs=-1):
+    """
+    Probabilidades do modelo nacional fora da amostra para todos os registros.
+
+    Cada registro é previsto por um clone do campeão treinado nos demais folds, de modo
+    que a comparação com os modelos por segmento não favoreça o nacional por já ter
+    visto os dados de treino.
+    """
+    cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
+    proba = cross_val_predict(
+        clone(champion_model), df[FEATURES], df['PERFORMANCE_ALVO'],
+        cv=cv, method='predict_proba', n_jobs=n_jobs
+    )[:, 1]
+    return pd.Series(proba, index=df.index)
+
+def train_segment_model(key, df_segment, champion_model, national_proba):
+    """
+    Treina o modelo de um segmento com o limiar (mediana) do próprio segmento.
+
+    Reaproveita o tipo e os hiperparâmetros do campeão nacional, sem novo grid search.
+    O ROC AUC do segmento é estimado por validação cruzada e comparado ao do modelo
+    nacional (`national_proba`, fora da amostra) nos mesmos registros e com o mesmo
+    alvo. Retorna None se o segmento não tiver as duas classes.
+    """
+    threshold = df_segment['TX_APROVACAO_9ANO'].median()
+    y = (df_segment['TX_APROVACAO_9ANO'] > threshold).astype(int)
+    n_minority = int(y.value_counts().min())
+    if y.nunique() < 2 or n_minority < 2:
+        return None
+    X = df_segment[FEATURES]
+
+    # Validação cruzada: o SMOTE de cada fold vê só (n_splits - 1) / n_splits da minoria
+    n_splits = min(5, n_minority)
+    model = clone(champion_model)
+    model.set_params(smote__k_neighbors=smote_neighbors(n_minority * (n_splits - 1) // n_splits))
+    cv = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42)
+    cv_proba = cross_val_predict(model, X, y, cv=cv, method='predict_proba')[:, 1]
+    segment_score = roc_auc_score(y, cv_proba)
+    national_score = roc_auc_score(y, national_proba.loc[df_segment.index])
+
+    model.set_params(smote__k_neighbors=smote_neighbors(n_minority))
+    model.fit(X, y)
+    return key, build_inference_pipeline(model), {
+        'threshold': float(threshold),
+        'n_samples': int(len(df_segment)),
+        'roc_auc': float(segment_score),
+        'national_roc_auc': float(national_score),
+    }
+
+def train_segment_models(df, champion_model, n_jobs=-1):
+    """
+    Treina, em paralelo, um modelo para cada segmento de `SEGMENT_LEVELS`.
+
+    Níveis cujas colunas não existem no dataset são ignorados. O `df` deve conter o
+    alvo nacional `PERFORMANCE_ALVO`, usado nas predições fora da amostra do campeão.
+    """
+    tasks = []
+    levels = []
+    for columns in SEGMENT_LEVELS:
+        if not all(column in df.columns for column in columns):
+            print(f"Colunas {columns} ausentes no dataset; nível de segmentação ignorado.")
+            continue
+        levels.append(columns)
+        for values, df_segment in df.groupby(columns):
+            if len(df_segment) >= MIN_SEGMENT_SIZE:
+                tasks.append((segment_key(columns, values), df_segment))
 
-def main(dataset_path):
+    national_proba = national_oof_proba(df, champion_model, n_jobs) if tasks else None
+    print(f"Treinando {len(tasks)} modelos por segmento...")
+    trained = Parallel(n_jobs=n_jobs)(
+        delayed(train_segment_model)(key, df_segment, champion_model, national_proba.loc[df_segment.index])
+        for key, df_segment in tasks
+    )
+    segment_models = {}
+    manifest = {'levels': levels, 'segments': {}, 'rejected': {}}
+    for result in trained:
+        if result is None:
+            continue
+        key, model, info = result
+        # Só registra o segmento se ele igualar ou superar o modelo nacional
+        if info['roc_auc'] < info['national_roc_auc']:
+            manifest['rejected'][key] = info
+            continue
+        segment_models[key] = model
+        manifest['segments'][key] = dict(info, path=f"segments/{key}.pkl")
+    print(f"  - {len(segment_models)} modelos por segmento registrados; "
+          f"{len(manifest['rejected'])} rejeitados por não superarem o modelo nacional.")
+    return segment_models, manifest
+
+def save_segment_artifacts(segment_models, manifest):
+    """Salva os modelos por segmento em `segments/` e o índice em `segments.json`."""
+    model_dir = Path(__file__).parent
+    segments_dir = model_dir / "segments"
+    segments_dir.mkdir(exist_ok=True)
+    for key, model in segment_models.items():
+        with open(model_dir / manifest['segments'][key]['path'], "wb") as f:
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+    with open(model_dir / "segments.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Modelos por segmento salvos em '{segments_dir}' e índice em 'segments.json'.")
+
+def stack(matrices):
+    """Empilha matrizes pré-processadas, densas ou esparsas."""
+    if any(sparse.issparse(m) for m in matrices):
+        return sparse.vstack(matrices).tocsr()
+    return np.vstack(matrices)
+
+def preprocessor_fingerprint(preprocessor):
+    """Identifica o pré-processador ajustado pelas categorias do One-Hot Encoding."""
+    categories = preprocessor.named_transformers_['cat'].categories_
+    return [list(map(str, c)) for c in categories]
+
+def preprocess_partitions(df, preprocessor, threshold):
+    """
+    Pré-processa cada partição (ano do censo) do DataFrame com o pré-processador do
+    campeão, com o alvo definido por `threshold`.
+
+    Retorna um dicionário {partição: {'X', 'y', 'fingerprint'}}.
+    """
+    fingerprint = preprocessor_fingerprint(preprocessor)
+    return {
+        int(partition): {
+            'X': preprocessor.transform(df_partition[FEATURES]),
+            'y': (df_partition['TX_APROVACAO_9ANO'] > threshold).astype(int).to_numpy(),
+            'fingerprint': fingerprint,
+        }
+        for partition, df_partition in df.groupby(PARTITION_COLUMN)
+    }
+
+def cache_partitions(partitions, cache_dir=CACHE_DIR):
+    """
+    Salva em `cache/` as partições pré-processadas, como registro dos anos treinados.
+
+    Retorna a lista de partições salvas.
+    """
+    cache_dir.mkdir(exist_ok=True)
+    for partition, data in partitions.items():
+        with open(cache_dir / f"partition_{partition}.pkl", "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return sorted(partitions)
+
+def save_holdout(X, y, cache_dir=CACHE_DIR):
+    """Salva o holdout fixo usado para comparar o modelo atualizado com o campeão."""
+    cache_dir.mkdir(exist_ok=True)
+    with open(cache_dir / "holdout.pkl", "wb") as f:
+        pickle.dump({'X': X, 'y': np.asarray(y)}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def check_incremental_support(champion_model):
+    """
+    Garante que o campeão admite atualização incremental.
+
+    Só o RandomForest é atualizado (novas árvores via warm start). A LogisticRegression
+    (solver liblinear) não tem warm start nem `partial_fit`; atualizá-la exigiria
+    reajustar todo o histórico, então o treinamento completo deve ser usado.
+    """
+    classifier = champion_model.named_steps['classifier']
+    if not isinstance(classifier, RandomForestClassifier):
+        raise ValueError(
+            f"Modo incremental só é suportado para RandomForest; o campeão atual é "
+            f"{type(classifier).__name__}. Execute o treinamento completo."
+        )
+
+def update_champion(champion_model, new_partitions, n_trained):
+    """
+    Gera um candidato a partir de um campeão RandomForest, sem refazer o grid search.
+
+    Adiciona ao modelo (warm start) árvores treinadas só nos dados novos, em número
+    proporcional à fração de dados novos em relação aos `n_trained` já usados.
+    O SMOTE é aplicado sobre as matrizes já pré-processadas.
+
+    Raises:
+        ValueError: Se o campeão não for RandomForest ou os dados novos não tiverem
+                    ao menos duas amostras de cada classe.
+    """
+    check_incremental_support(champion_model)
+
+    X = stack([p['X'] for p in new_partitions])
+    y = np.concatenate([p['y'] for p in new_partitions])
+    n_new = len(y)
+    n_minority = int(np.bincount(y, minlength=2).min())
+    if n_minority < 2:
+        raise ValueError(
+            f"Os dados novos têm {n_minority} amostra(s) na classe minoritária com o limiar atual; "
+            "são necessárias ao menos 2 de cada classe."
+        )
+
+    candidate = copy.deepcopy(champion_model)
+    classifier = candidate.named_steps['classifier']
+    smote = candidate.named_steps['smote']
+    smote.set_params(k_neighbors=smote_neighbors(n_minority))
+    X, y = smote.fit_resample(X, y)
+
+    new_trees = max(MIN_NEW_TREES, round(classifier.n_estimators * n_new / max(n_trained, 1)))
+    classifier.set_params(warm_start=True, n_estimators=classifier.n_estimators + new_trees)
+    print(f"  - Adicionando {new_trees} árvores treinadas em {n_new} registros novos.")
+
+    classifier.fit(X, y)
+    return candidate
+
+def run_incremental(df, model_dir=MODEL_DIR):
+    """
+    Atualiza o campeão com as partições (anos do censo) ainda não treinadas e o promove
+    somente se o desempenho no holdout fixo não cair mais que `PROMOTION_TOLERANCE`.
+
+    Atualizações inviáveis (dados novos sem as duas classes) são registradas em
+    `incremental_updates` como não promovidas, sem interromper a execução.
+
+    Raises:
+        ValueError: Se não houver um treinamento completo anterior (incluindo o
+                    holdout em `cache/`, que não é versionado) ou se o campeão não
+                    suportar atualização incremental.
+    """
+    model_dir = Path(model_dir)
+    cache_dir = model_dir / "cache"
+    with open(model_dir / "model_results.json", "r") as f:
+        results = json.load(f)
+    if 'trained_partitions' not in results:
+        raise ValueError("Resultados sem 'trained_partitions'; execute primeiro o treinamento completo.")
+
+    trained = results['trained_partitions']
+    df_new = df[~df[PARTITION_COLUMN].isin(trained)]
+    if df_new.empty:
+        print(f"Nenhuma partição nova de '{PARTITION_COLUMN}' (já treinadas: {trained}).")
+        return
+
+    with open(model_dir / "champion_model.pkl", "rb") as f:
+        champion_model = pickle.load(f)
+    check_incremental_support(champion_model)
+    if not (cache_dir / "holdout.pkl").exists():
+        raise ValueError(
+            f"Holdout fixo não encontrado em '{cache_dir}'; execute o treinamento completo nesta máquina."
+        )
+    with open(cache_dir / "holdout.pkl", "rb") as f:
+        holdout = pickle.load(f)
+    preprocessor = champion_model.named_steps['preprocessor']
+
+    # Mesmo limiar do treinamento completo, para manter o alvo comparável
+    partitions = preprocess_partitions(df_new, preprocessor, results['target_threshold'])
+    new_partitions = sorted(partitions)
+    print(f"Partições novas: {new_partitions}")
+    update = {'partitions': new_partitions}
+    try:
+        candidate = update_champion(champion_model, list(partitions.values()), results['trained_samples'])
+    except ValueError as e:
+        print(f"Atualização ignorada: {e}")
+        update.update(promoted=False, reason=str(e))
+        results.setdefault('incremental_updates', []).append(update)
+        with open(model_dir / "model_results.json", "w") as f:
+            json.dump(results, f, indent=2)
+        return
+
+    previous_score = roc_auc_score(holdout['y'], champion_model.predict_proba(holdout['X'])[:, 1])
+    candidate_score = roc_auc_score(holdout['y'], candidate.predict_proba(holdout['X'])[:, 1])
+    promoted = candidate_score >= previous_score - PROMOTION_TOLERANCE
+    print(f"ROC AUC no holdout: campeão atual = {previous_score:.4f}, candidato = {candidate_score:.4f}")
+
+    update.update(
+        previous_score_roc_auc=previous_score,
+        candidate_score_roc_auc=candidate_score,
+        promoted=bool(promoted),
+    )
+    results.setdefault('incremental_updates', []).append(update)
+    if promoted:
+        print("Candidato promovido a campeão.")
+        cache_partitions(partitions, cache_dir)
+        results['trained_partitions'] = sorted(trained + new_partitions)
+        results['trained_samples'] += len(df_new)
+        results['feature_importances'] = impurity_importances(candidate)
+        results.update(compute_interpretability(candidate, holdout['X'], holdout['y']))
+        save_artifacts(candidate, preprocessor, results, model_dir=model_dir)
+    else:
+        print("Candidato rejeitado; o campeão atual foi mantido.")
+        with open(model_dir / "model_results.json", "w") as f:
+            json.dump(results, f, indent=2)
+
+def main(dataset_path, incremental=False):
     df = load_dataset(dataset_path)
+    if incremental:
+        if PARTITION_COLUMN not in df.columns:
+            print(f"Erro: o modo incremental requer a coluna '{PARTITION_COLUMN}'.", file=sys.stderr)
+            sys.exit(1)
+        try:
+            run_incremental(df)
+        except ValueError as e:
+            print(f"Erro: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
     median_aprovacao = df['TX_APROVACAO_9ANO'].median()
     df['PERFORMANCE_ALVO'] = (df['TX_APROVACAO_9ANO'] > median_aprovacao).astype(int)
     print(f"Problema de classificação definido: PERFORMANCE_ALVO (1 se TX_APROVACAO_9ANO > {median_aprovacao:.3f}, 0 caso contrário)")
 
-    features = ['PARTIDO', 'TX_APROVACAO_5ANO', 'TX_REPROVACAO_5ANO', 'TX_ABANDONO_5ANO']
     target = 'PERFORMANCE_ALVO'
-    X = df[features]
+    X = df[FEATURES]
     y = df[target]
 
     preprocessor = ColumnTransformer(
@@ -119,12 +536,30 @@ def main(dataset_path):
         remainder='passthrough'
     )
 
-    champion_model, final_preprocessor, results = run_experiment(X, y, preprocessor)
+    champion_model, final_preprocessor, results, holdout_index = run_experiment(X, y, preprocessor)
+    results['target_threshold'] = float(median_aprovacao)
+
+    # Cache por partição e holdout fixo para as atualizações incrementais
+    if PARTITION_COLUMN in df.columns:
+        save_holdout(X.loc[holdout_index], y.loc[holdout_index])
+        results['trained_partitions'] = cache_partitions(preprocess_partitions(
+            df.drop(index=holdout_index), champion_model.named_steps['preprocessor'], median_aprovacao
+        ))
+        results['trained_samples'] = int(len(df) - len(holdout_index))
+        # O benchmark não é refeito nas atualizações incrementais
+        results['benchmark_partitions'] = list(results['trained_partitions'])
     save_artifacts(champion_model, final_preprocessor, results)
 
+    segment_models, manifest = train_segment_models(df, champion_model)
+    save_segment_artifacts(segment_models, manifest)
+
 if __name__ == "__main__":
     dataset_path = Path(__file__).parent.parent / "sdp-data" / "dados_completos.csv"
     if not dataset_path.exists():
         print(f"Erro: Dataset '{dataset_path}' não encontrado.", file=sys.stderr)
         sys.exit(1)
-    main(dataset_path)
+    parser = argparse.ArgumentParser(description="Pipeline de treinamento do modelo.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Atualiza o campeão apenas com os anos do censo ainda não treinados.")
+    args = parser.parse_args()
+    main(dataset_path, incremental=args.incremental)
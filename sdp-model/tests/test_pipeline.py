@@ -0,0 +1,241 @@
+import unittest
+import json
+import pickle
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.preprocessing import OneHotEncoder
+from imblearn.over_sampling import SMOTE
+from imblearn.pipeline import Pipeline as ImbPipeline
+
+import pipeline
+
+def criar_dados(ano, n, seed, deslocamento=0.0):
+    """Gera um ano do censo sintético em que a aprovação do 9º ano segue a do 5º ano."""
+    rng = np.random.default_rng(seed)
+    aprovacao = rng.uniform(0.7, 1.0, n)
+    abandono = rng.uniform(0.0, 0.05, n)
+    return pd.DataFrame({
+        'NU_ANO_CENSO': ano,
+        'PARTIDO': rng.choice(['PT', 'PSDB', 'MDB'], n),
+        'TX_APROVACAO_5ANO': aprovacao,
+        'TX_REPROVACAO_5ANO': 1 - aprovacao - abandono,
+        'TX_ABANDONO_5ANO': abandono,
+        'TX_APROVACAO_9ANO': np.clip(aprovacao * 0.8 + deslocamento + rng.normal(0, 0.05, n), 0, 1),
+    })
+
+def criar_campeao(classifier):
+    """Monta o pipeline do campeão no mesmo formato da pipeline de modelo."""
+    return ImbPipeline(steps=[
+        ('preprocessor', ColumnTransformer(
+            transformers=[('cat', OneHotEncoder(handle_unknown='ignore'), ['PARTIDO'])],
+            remainder='passthrough')),
+        ('smote', SMOTE(random_state=42)),
+        ('classifier', classifier),
+    ])
+
+def treinamento_completo(model_dir, df, classifier):
+    """Reproduz os artefatos do treinamento completo (campeão, cache e holdout)."""
+    threshold = df['TX_APROVACAO_9ANO'].median()
+    y = (df['TX_APROVACAO_9ANO'] > threshold).astype(int)
+    holdout_index = df.sample(frac=0.2, random_state=42).index
+    train = df.drop(index=holdout_index)
+
+    model = criar_campeao(classifier).fit(train[pipeline.FEATURES], y.loc[train.index])
+    cache_dir = model_dir / "cache"
+    pipeline.save_holdout(df.loc[holdout_index, pipeline.FEATURES], y.loc[holdout_index], cache_dir)
+    results = {
+        'target_threshold': float(threshold),
+        'trained_partitions': pipeline.cache_partitions(
+            pipeline.preprocess_partitions(train, model.named_steps['preprocessor'], threshold), cache_dir),
+        'trained_samples': len(train),
+        'feature_importances': pipeline.impurity_importances(model),
+    }
+    pipeline.save_artifacts(model, model.named_steps['preprocessor'], results, model_dir=model_dir)
+    return model
+
+def particao(model, df, threshold):
+    """Pré-processa um DataFrame no formato das partições em cache."""
+    return {
+        'X': model.named_steps['preprocessor'].transform(df[pipeline.FEATURES]),
+        'y': (df['TX_APROVACAO_9ANO'] > threshold).astype(int).to_numpy(),
+    }
+
+class TestUpdateChampion(unittest.TestCase):
+    def setUp(self):
+        """Treina um campeão RandomForest em um ano sintético."""
+        self.df = criar_dados(2022, 400, seed=0)
+        self.threshold = self.df['TX_APROVACAO_9ANO'].median()
+        y = (self.df['TX_APROVACAO_9ANO'] > self.threshold).astype(int)
+        self.champion = criar_campeao(RandomForestClassifier(n_estimators=20, max_depth=5, random_state=42))
+        self.champion.fit(self.df[pipeline.FEATURES], y)
+
+    def test_random_forest_adds_trees(self):
+        """Testa se o RandomForest ganha árvores novas sem alterar o campeão original."""
+        novos = particao(self.champion, criar_dados(2023, 200, seed=1), self.threshold)
+        candidate = pipeline.update_champion(self.champion, [novos], n_trained=400)
+
+        self.assertEqual(self.champion.named_steps['classifier'].n_estimators, 20, msg="O campeão original não deve mudar")
+        self.assertEqual(candidate.named_steps['classifier'].n_estimators, 30, msg="Devem ser adicionadas 20 * 200 / 400 árvores")
+        self.assertEqual(len(candidate.named_steps['classifier'].estimators_), 30)
+
+    def test_small_minority_class(self):
+        """Testa se uma classe minoritária pequena ajusta os vizinhos do SMOTE em vez de falhar."""
+        novos = criar_dados(2023, 30, seed=1)
+        novos['TX_APROVACAO_9ANO'] = self.threshold + 0.1
+        novos.loc[novos.index[:2], 'TX_APROVACAO_9ANO'] = self.threshold - 0.1
+        candidate = pipeline.update_champion(self.champion, [particao(self.champion, novos, self.threshold)], n_trained=400)
+        self.assertGreater(candidate.named_steps['classifier'].n_estimators, 20)
+
+    def test_single_class_is_rejected(self):
+        """Testa se dados novos com uma única classe geram um erro claro."""
+        novos = criar_dados(2023, 50, seed=1)
+        novos['TX_APROVACAO_9ANO'] = 1.0
+        with self.assertRaisesRegex(ValueError, 'classe minoritária'):
+            pipeline.update_champion(self.champion, [particao(self.champion, novos, self.threshold)], n_trained=400)
+
+    def test_logistic_regression_is_not_supported(self):
+        """Testa se o modo incremental recusa um campeão LogisticRegression."""
+        champion = criar_campeao(LogisticRegression(solver='liblinear'))
+        champion.fit(self.df[pipeline.FEATURES], (self.df['TX_APROVACAO_9ANO'] > self.threshold).astype(int))
+        novos = particao(champion, criar_dados(2023, 200, seed=1), self.threshold)
+        with self.assertRaisesRegex(ValueError, 'RandomForest'):
+            pipeline.update_champion(champion, [novos], n_trained=400)
+
+class TestInterpretability(unittest.TestCase):
+    def test_logistic_regression_champion(self):
+        """Testa a importância por permutação e a dependência parcial de um campeão LogisticRegression."""
+        original_repeats = pipeline.PERMUTATION_REPEATS
+        pipeline.PERMUTATION_REPEATS = 3
+        self.addCleanup(setattr, pipeline, 'PERMUTATION_REPEATS', original_repeats)
+
+        df = criar_dados(2022, 300, seed=0)
+        y = (df['TX_APROVACAO_9ANO'] > df['TX_APROVACAO_9ANO'].median()).astype(int)
+        champion = criar_campeao(LogisticRegression(solver='liblinear')).fit(df[pipeline.FEATURES], y)
+
+        result = pipeline.compute_interpretability(champion, df[pipeline.FEATURES], y, n_jobs=2)
+
+        permutation = result['permutation_importance']
+        self.assertEqual(permutation['n_repeats'], 3)
+        self.assertEqual(set(permutation['features']), set(pipeline.FEATURES))
+        for feature, scores in permutation['features'].items():
+            self.assertEqual(len(scores['scores']), 3, msg=f"Repetições incorretas para {feature}")
+        self.assertGreater(
+            permutation['features']['TX_APROVACAO_5ANO']['mean'], 0,
+            msg="Embaralhar a feature que define o alvo deve reduzir o ROC AUC"
+        )
+
+        pdp = result['partial_dependence']
+        self.assertEqual([grid['features'] for grid in pdp['1d']], [[f] for f in pipeline.FEATURES])
+        self.assertEqual(len(pdp['2d']), 6)
+        for grid in pdp['1d'] + pdp['2d']:
+            shape = tuple(len(values) for values in grid['grid'])
+            self.assertEqual(np.shape(grid['average']), shape, msg=f"Grade inconsistente para {grid['features']}")
+        self.assertEqual(len(pdp['1d'][0]['grid'][0]), 3, msg="PARTIDO deve ter uma entrada por categoria")
+
+class TestSegmentModels(unittest.TestCase):
+    def test_national_model_is_scored_out_of_sample(self):
+        """Testa se o modelo nacional é avaliado fora da amostra na comparação com os segmentos."""
+        # Alvo sem relação com as features: um RandomForest sem limite de profundidade
+        # decora o treino, então só um ROC AUC fora da amostra fica perto de 0,5
+        df = pd.concat([criar_dados(2022, 200, seed=seed) for seed in range(2)], ignore_index=True)
+        df['SG_UF'] = np.repeat(['CE', 'PI'], 200)
+        df['NO_REGIAO'] = 'Nordeste'
+        df['TX_APROVACAO_9ANO'] = np.random.default_rng(7).uniform(0.5, 1.0, len(df))
+        df['PERFORMANCE_ALVO'] = (df['TX_APROVACAO_9ANO'] > df['TX_APROVACAO_9ANO'].median()).astype(int)
+
+        champion = criar_campeao(RandomForestClassifier(n_estimators=30, random_state=42))
+        champion.fit(df[pipeline.FEATURES], df['PERFORMANCE_ALVO'])
+        in_sample = roc_auc_score(df['PERFORMANCE_ALVO'], champion.predict_proba(df[pipeline.FEATURES])[:, 1])
+        self.assertGreater(in_sample, 0.95, msg="Pré-condição: o campeão deve decorar o treino")
+
+        _, manifest = pipeline.train_segment_models(df, champion, n_jobs=1)
+
+        infos = {**manifest['segments'], **manifest['rejected']}
+        self.assertEqual(
+            set(infos), {'SG_UF=CE__NU_ANO_CENSO=2022', 'SG_UF=PI__NU_ANO_CENSO=2022', 'NO_REGIAO=Nordeste__NU_ANO_CENSO=2022'}
+        )
+        for key, info in infos.items():
+            self.assertLess(info['national_roc_auc'], 0.7, msg=f"ROC AUC nacional inflado em {key}: {info}")
+
+class TestRunIncremental(unittest.TestCase):
+    def setUp(self):
+        """Cria um diretório de modelo temporário com um treinamento completo de 2022."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.model_dir = Path(self.tmp.name)
+        self.df_old = criar_dados(2022, 400, seed=0)
+
+        # Reduz o custo da interpretabilidade recalculada na promoção
+        self.original_repeats = pipeline.PERMUTATION_REPEATS
+        pipeline.PERMUTATION_REPEATS = 2
+        self.addCleanup(setattr, pipeline, 'PERMUTATION_REPEATS', self.original_repeats)
+
+    def resultados(self):
+        with open(self.model_dir / "model_results.json") as f:
+            return json.load(f)
+
+    def test_promotes_updated_random_forest(self):
+        """Testa a promoção: partições, importâncias e artefatos são atualizados."""
+        treinamento_completo(self.model_dir, self.df_old, RandomForestClassifier(n_estimators=20, max_depth=5, random_state=42))
+        old_importances = self.resultados()['feature_importances']
+
+        pipeline.run_incremental(pd.concat([self.df_old, criar_dados(2023, 400, seed=1)]), model_dir=self.model_dir)
+
+        results = self.resultados()
+        self.assertTrue(results['incremental_updates'][-1]['promoted'], msg=f"Atualização deveria ser promovida: {results['incremental_updates']}")
+        self.assertEqual(results['trained_partitions'], [2022, 2023])
+        self.assertTrue((self.model_dir / "cache" / "partition_2023.pkl").exists(), msg="O ano promovido deve ser registrado no cache")
+        self.assertNotEqual(results['feature_importances'], old_importances, msg="As importâncias devem refletir o novo campeão")
+        with open(self.model_dir / "champion_model.pkl", "rb") as f:
+            self.assertGreater(pickle.load(f).named_steps['classifier'].n_estimators, 20)
+
+    def test_rejects_candidate_below_tolerance(self):
+        """Testa se um candidato pior que a tolerância não substitui o campeão."""
+        treinamento_completo(self.model_dir, self.df_old, RandomForestClassifier(n_estimators=20, max_depth=5, random_state=42))
+        original_tolerance = pipeline.PROMOTION_TOLERANCE
+        pipeline.PROMOTION_TOLERANCE = -1.0  # exige um ganho impossível de ROC AUC
+        self.addCleanup(setattr, pipeline, 'PROMOTION_TOLERANCE', original_tolerance)
+
+        pipeline.run_incremental(pd.concat([self.df_old, criar_dados(2023, 400, seed=1)]), model_dir=self.model_dir)
+
+        results = self.resultados()
+        self.assertFalse(results['incremental_updates'][-1]['promoted'])
+        self.assertEqual(results['trained_partitions'], [2022], msg="Partições rejeitadas não devem ser marcadas como treinadas")
+        self.assertFalse((self.model_dir / "cache" / "partition_2023.pkl").exists())
+        with open(self.model_dir / "champion_model.pkl", "rb") as f:
+            self.assertEqual(pickle.load(f).named_steps['classifier'].n_estimators, 20)
+
+    def test_single_class_update_is_skipped(self):
+        """Testa se um ano novo com uma única classe é registrado e ignorado, sem erro."""
+        treinamento_completo(self.model_dir, self.df_old, RandomForestClassifier(n_estimators=20, max_depth=5, random_state=42))
+        df_new = criar_dados(2023, 100, seed=1)
+        df_new['TX_APROVACAO_9ANO'] = 1.0
+
+        pipeline.run_incremental(pd.concat([self.df_old, df_new]), model_dir=self.model_dir)
+
+        update = self.resultados()['incremental_updates'][-1]
+        self.assertFalse(update['promoted'])
+        self.assertIn('classe minoritária', update['reason'])
+
+    def test_missing_holdout_is_reported(self):
+        """Testa se a falta do holdout local (cache não versionado) gera um erro claro."""
+        treinamento_completo(self.model_dir, self.df_old, RandomForestClassifier(n_estimators=20, max_depth=5, random_state=42))
+        (self.model_dir / "cache" / "holdout.pkl").unlink()
+        with self.assertRaisesRegex(ValueError, 'Holdout fixo'):
+            pipeline.run_incremental(pd.concat([self.df_old, criar_dados(2023, 100, seed=1)]), model_dir=self.model_dir)
+
+    def test_logistic_regression_champion_is_refused(self):
+        """Testa se o modo incremental recusa um campeão LogisticRegression."""
+        treinamento_completo(self.model_dir, self.df_old, LogisticRegression(solver='liblinear'))
+        with self.assertRaisesRegex(ValueError, 'treinamento completo'):
+            pipeline.run_incremental(pd.concat([self.df_old, criar_dados(2023, 100, seed=1)]), model_dir=self.model_dir)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -43,6 +43,11 @@ def get_modelo_results_html(results):
     for name, data in results['benchmark'].items():
         html += f"<tr><td>{name}</td><td>{data['best_score_roc_auc']:.4f}</td><td>{json.dumps(data['best_params'])}</td></tr>"
     html += "</table>"
+    promoted = [u for u in results.get('incremental_updates', []) if u['promoted']]
+    if promoted:
+        novos = sorted(p for u in promoted for p in u['partitions'])
+        html += (f"<p><i>O campeão foi atualizado incrementalmente com os anos {novos}; o benchmark "
+                 f"refere-se ao treinamento completo (anos {results.get('benchmark_partitions')}).</i></p>")
     return html
 
 def gerar_grafico_feature_importance(importances_dict, assets_dir):
@@ -59,6 +64,55 @@ def gerar_grafico_feature_importance(importances_dict, assets_dir):
     html_embed = gerar_grafico_para_html(fig, save_path)
     return html_embed, save_path
 
+def gerar_grafico_permutation_importance(permutation_importance, assets_dir):
+    """Gera o gráfico da importância por permutação (média e desvio entre repetições)."""
+    if not permutation_importance:
+        return None
+
+    features = pd.DataFrame(permutation_importance['features']).T.sort_values('mean')
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.barh(features.index, features['mean'], xerr=features['std'], color=sns.color_palette()[0])
+    ax.set_title(f"Importância por Permutação (queda de {permutation_importance['scoring'].upper()}, {permutation_importance['n_repeats']} repetições)")
+    ax.set_xlabel('Queda média do score no conjunto de teste')
+
+    return gerar_grafico_para_html(fig, assets_dir / "permutation_importance.png")
+
+def gerar_graficos_dependencia_parcial(partial_dependence, assets_dir):
+    """Gera os gráficos de dependência parcial 1-D e 2-D (somente pares de taxas)."""
+    if not partial_dependence:
+        return {}
+    plots = {}
+
+    grids_1d = partial_dependence['1d']
+    fig, axes = plt.subplots(1, len(grids_1d), figsize=(5 * len(grids_1d), 4), squeeze=False)
+    for ax, grid in zip(axes[0], grids_1d):
+        feature, values = grid['features'][0], grid['grid'][0]
+        if isinstance(values[0], str):
+            ax.bar(values, grid['average'])
+            ax.tick_params(axis='x', rotation=90)
+        else:
+            ax.plot(values, grid['average'])
+        ax.set_title(feature)
+        ax.set_ylabel('P(Alta) média')
+    fig.suptitle('Dependência Parcial 1-D')
+    fig.tight_layout()
+    plots['1d'] = gerar_grafico_para_html(fig, assets_dir / "partial_dependence.png")
+
+    grids_2d = [g for g in partial_dependence['2d'] if not any(isinstance(v[0], str) for v in g['grid'])]
+    if grids_2d:
+        fig, axes = plt.subplots(1, len(grids_2d), figsize=(5 * len(grids_2d), 4), squeeze=False)
+        for ax, grid in zip(axes[0], grids_2d):
+            x_values, y_values = grid['grid']
+            contour = ax.contourf(x_values, y_values, np.asarray(grid['average']).T, levels=10, cmap='viridis')
+            ax.set_xlabel(grid['features'][0])
+            ax.set_ylabel(grid['features'][1])
+            fig.colorbar(contour, ax=ax, label='P(Alta) média')
+        fig.suptitle('Dependência Parcial 2-D')
+        fig.tight_layout()
+        plots['2d'] = gerar_grafico_para_html(fig, assets_dir / "partial_dependence_2d.png")
+
+    return plots
+
 # --- Funções Auxiliares ---
 
 def gerar_grafico_para_html(fig, save_path=None):
@@ -99,7 +153,20 @@ def gerar_graficos_dados(df, assets_dir):
     
     return plots
 
-def gerar_relatorio_html(data_stats, model_results, plots_dados, plot_importance, output_path):
+def get_interpretabilidade_html(plot_permutation, plots_pdp):
+    """Monta a seção de interpretabilidade, se os resultados estiverem disponíveis."""
+    if not plot_permutation and not plots_pdp:
+        return ""
+    html = "<h2>Interpretabilidade do Modelo</h2><div class=\"grid\">"
+    if plot_permutation:
+        html += f'<div class="card"><h3>Importância por Permutação</h3><img src="{plot_permutation}" alt="Gráfico de Importância por Permutação"></div>'
+    for key, title in [('1d', 'Dependência Parcial 1-D'), ('2d', 'Dependência Parcial 2-D')]:
+        if key in plots_pdp:
+            html += f'<div class="card"><h3>{title}</h3><img src="{plots_pdp[key]}" alt="Gráfico de {title}"></div>'
+    html += "</div>"
+    return html
+
+def gerar_relatorio_html(data_stats, model_results, plots_dados, plot_importance, output_path, interpretabilidade=""):
     template = f"""
     <!DOCTYPE html><html lang="pt-br"><head><meta charset="UTF-8"><title>Relatório de Análise</title>
     <style>
@@ -130,7 +197,9 @@ def gerar_relatorio_html(data_stats, model_results, plots_dados, plot_importance
                 {'<img src="' + plot_importance + '" alt="Gráfico de Importância das Features">' if plot_importance else '<p>Gráfico de importância não disponível (modelo campeão não foi RandomForest).</p>'}
             </div>
         </div>
-        
+
+        {interpretabilidade}
+
         <h2>Conclusões</h2>
         <div class="card">
             <p>A análise exploratória e a modelagem indicam que existe uma correlação observável entre as features de entrada (partido, taxas do 5º ano) e a performance educacional no 9º ano. O modelo RandomForest foi o que melhor capturou essas relações, alcançando um score ROC AUC significativo. As features mais importantes, segundo o modelo, fornecem um insight sobre quais fatores tiveram maior peso na predição.</p>
@@ -160,8 +229,11 @@ def main():
     model_results_html = get_modelo_results_html(model_results)
     plots_dados = gerar_graficos_dados(df, assets_dir)
     plot_importance_html, _ = gerar_grafico_feature_importance(model_results.get('feature_importances'), assets_dir)
+    plot_permutation_html = gerar_grafico_permutation_importance(model_results.get('permutation_importance'), assets_dir)
+    plots_pdp_html = gerar_graficos_dependencia_parcial(model_results.get('partial_dependence'), assets_dir)
+    interpretabilidade_html = get_interpretabilidade_html(plot_permutation_html, plots_pdp_html)
     
-    gerar_relatorio_html(data_stats_html, model_results_html, plots_dados, plot_importance_html, output_path)
+    gerar_relatorio_html(data_stats_html, model_results_html, plots_dados, plot_importance_html, output_path, interpretabilidade_html)
     print("Relatório completo gerado com sucesso!")
 
 if __name__ == "__main__":
@@ -1,23 +1,44 @@
+import os
+import threading
 from flask import Flask, request, jsonify
-from sdp.service import PerformancePredictionService
 
 app = Flask(__name__)
 
-# Inicializa o serviço (carrega o modelo e o pré-processador na memória)
-try:
-    service = PerformancePredictionService()
-    print("Serviço de predição inicializado com sucesso.")
-except Exception as e:
-    print(f"Erro ao inicializar o serviço de predição: {e}")
-    service = None
+# O serviço (e com ele scikit-learn, pandas e o modelo) só é carregado
+# no primeiro uso, mantendo o import deste módulo leve.
+service = None
+service_error = None
+service_lock = threading.Lock()
+
+def get_service():
+    """
+    Retorna o serviço de predição, inicializando-o na primeira chamada.
+
+    Em caso de falha, o erro fica registrado em `service_error` e uma nova
+    tentativa é feita na próxima chamada. O lock garante uma única inicialização
+    mesmo com requisições simultâneas.
+    """
+    global service, service_error
+    if service is None:
+        with service_lock:
+            if service is None:
+                try:
+                    from sdp.service import PerformancePredictionService
+                    service = PerformancePredictionService()
+                    service_error = None
+                    print("Serviço de predição inicializado com sucesso.")
+                except Exception as e:
+                    service_error = str(e)
+                    print(f"Erro ao inicializar o serviço de predição: {e}")
+    return service
 
 @app.route('/predict', methods=['POST'])
 def predict():
     """
     Endpoint para receber os dados e retornar a predição de performance.
     """
-    if not service:
-        return jsonify({'error': 'Serviço não está disponível.'}), 503
+    if not get_service():
+        return jsonify({'error': 'Serviço não está disponível.', 'detail': service_error}), 503
 
     if not request.is_json:
         return jsonify({'error': 'Requisição deve ser do tipo JSON.'}), 400
@@ -40,6 +61,38 @@ def predict():
         print(f"Erro durante a predição: {e}")
         return jsonify({'error': 'Ocorreu um erro interno ao processar a requisição.'}), 500
 
+@app.route('/whatif', methods=['POST'])
+def whatif():
+    """
+    Endpoint de simulação what-if: avalia uma grade de cenários a partir de um registro base.
+    """
+    if not get_service():
+        return jsonify({'error': 'Serviço não está disponível.', 'detail': service_error}), 503
+
+    if not request.is_json:
+        return jsonify({'error': 'Requisição deve ser do tipo JSON.'}), 400
+
+    try:
+        data = request.get_json()
+        if not isinstance(data, dict) or not isinstance(data.get('base', {}), dict):
+            return jsonify({'error': "O corpo deve ser um objeto JSON com o registro 'base'."}), 400
+
+        base = data.get('base', {})
+        required_keys = ['PARTIDO', 'TX_APROVACAO_5ANO', 'TX_REPROVACAO_5ANO', 'TX_ABANDONO_5ANO']
+        if not all(key in base for key in required_keys):
+            return jsonify({'error': f'Registro base incompleto. Chaves necessárias: {required_keys}'}), 400
+        if not data.get('sweep') and not data.get('PARTIDO'):
+            return jsonify({'error': "Informe 'sweep' e/ou uma lista de valores em 'PARTIDO'."}), 400
+
+        result = service.whatif(base, data.get('sweep', []), data.get('PARTIDO'))
+        return jsonify(result)
+
+    except (ValueError, KeyError, TypeError) as e:
+        return jsonify({'error': f'Varredura inválida: {e}'}), 400
+    except Exception as e:
+        print(f"Erro durante a simulação what-if: {e}")
+        return jsonify({'error': 'Ocorreu um erro interno ao processar a requisição.'}), 500
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """
@@ -47,6 +100,30 @@ def health_check():
     """
     return jsonify({'status': 'ok'}), 200
 
+@app.route('/startup', methods=['GET'])
+def startup_report():
+    """
+    Endpoint com o tempo de inicialização por fase e a memória usada na carga do serviço.
+    """
+    if not get_service():
+        return jsonify({'error': 'Serviço não está disponível.', 'detail': service_error}), 503
+    return jsonify(service.startup_report()), 200
+
+@app.route('/segments', methods=['GET'])
+def segments_status():
+    """
+    Endpoint com o estado do pool de modelos por segmento.
+    """
+    if not get_service():
+        return jsonify({'error': 'Serviço não está disponível.', 'detail': service_error}), 503
+    if not service.pool:
+        return jsonify({'error': 'Nenhum modelo por segmento disponível.'}), 404
+    return jsonify(service.pool.stats()), 200
+
+# Com SDP_PRELOAD=1 o modelo é carregado no import (ex.: `gunicorn --preload`)
+if os.environ.get('SDP_PRELOAD') == '1':
+    get_service()
+
 if __name__ == '__main__':
     # Executando com o servidor de desenvolvimento do Flask
     # Para produção, use um servidor WSGI como Gunicorn
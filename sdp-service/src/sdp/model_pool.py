@@ -0,0 +1,127 @@
+import json
+import pickle
+import threading
+from collections import Counter, OrderedDict
+from pathlib import Path
+
+class ModelPool:
+    """
+    Pool LRU de modelos por segmento, com carga sob demanda e limite de memória.
+
+    O tamanho de cada modelo é estimado pelo tamanho do seu arquivo pickle. Quando a
+    soma ultrapassa `max_memory_mb`, os modelos menos usados recentemente são
+    descarregados (o último carregado sempre permanece residente).
+    """
+
+    def __init__(self, model_dir, manifest, max_memory_mb=256.0):
+        self.model_dir = Path(model_dir)
+        self.levels = manifest['levels']
+        self.segments = manifest['segments']
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+
+        self._models = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        self.usage = Counter()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_dir(cls, model_dir, max_memory_mb=256.0):
+        """Cria o pool a partir do `segments.json` do diretório, ou retorna None se não existir."""
+        manifest_path = Path(model_dir) / 'segments.json'
+        if not manifest_path.exists():
+            return None
+        with open(manifest_path, 'r') as f:
+            return cls(model_dir, json.load(f), max_memory_mb)
+
+    def resolve(self, input_data: dict):
+        """
+        Retorna a chave do segmento mais específico com modelo para a requisição, ou None.
+        """
+        for columns in self.levels:
+            if not all(input_data.get(column) is not None for column in columns):
+                continue
+            key = "__".join(f"{column}={input_data[column]}" for column in columns)
+            if key in self.segments:
+                return key
+        return None
+
+    def get(self, key):
+        """
+        Retorna o modelo do segmento, carregando-o (e descarregando outros) se necessário.
+
+        A leitura do disco é feita fora do lock, para não bloquear as requisições
+        atendidas por modelos já residentes.
+        """
+        with self._lock:
+            self.usage[key] += 1
+            if key in self._models:
+                self.hits += 1
+                self._models.move_to_end(key)
+                return self._models[key][0]
+            self.misses += 1
+
+        model, size = self._read(key)
+        with self._lock:
+            return self._insert(key, model, size)
+
+    def threshold(self, key):
+        """Limiar (mediana do segmento) que define o rótulo "Alta" no modelo do segmento."""
+        return self.segments[key]['threshold']
+
+    def preload(self, keys):
+        """Carrega antecipadamente os segmentos informados, na ordem dada."""
+        for key in keys:
+            if key in self.segments and key not in self._models:
+                model, size = self._read(key)
+                with self._lock:
+                    self._insert(key, model, size)
+
+    def most_used(self, n, usage=None):
+        """
+        Retorna os `n` segmentos mais usados segundo `usage`; sem histórico de uso,
+        ordena pelo número de amostras de treino.
+        """
+        if usage:
+            ranked = sorted(self.segments, key=lambda k: usage.get(k, 0), reverse=True)
+        else:
+            ranked = sorted(self.segments, key=lambda k: self.segments[k]['n_samples'], reverse=True)
+        return ranked[:n]
+
+    def stats(self) -> dict:
+        """Retorna o estado do pool (modelos residentes, memória e contadores)."""
+        with self._lock:
+            return {
+                'resident': list(self._models),
+                'available': len(self.segments),
+                'memory_mb': round(self._memory_bytes / (1024 * 1024), 2),
+                'max_memory_mb': round(self.max_memory_bytes / (1024 * 1024), 2),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'usage': dict(self.usage.most_common()),
+            }
+
+    def _read(self, key):
+        """Lê e desserializa o modelo do disco, retornando-o com o tamanho do arquivo."""
+        path = self.model_dir / self.segments[key]['path']
+        with open(path, 'rb') as f:
+            return pickle.load(f), path.stat().st_size
+
+    def _insert(self, key, model, size):
+        """Insere o modelo e aplica a política LRU. Deve ser chamado com o lock."""
+        if key in self._models:
+            # Outra requisição carregou o mesmo segmento enquanto este era lido
+            self._models.move_to_end(key)
+            return self._models[key][0]
+
+        self._models[key] = (model, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes and len(self._models) > 1:
+            _, (_, evicted_size) = self._models.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self.evictions += 1
+        return model
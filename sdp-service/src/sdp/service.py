@@ -1,28 +1,166 @@
+import atexit
+import json
+import os
 import pickle
-import pandas as pd
+import sys
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
+from sdp.model_pool import ModelPool
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+FEATURES = ['PARTIDO', 'TX_APROVACAO_5ANO', 'TX_REPROVACAO_5ANO', 'TX_ABANDONO_5ANO']
+RATE_FEATURES = FEATURES[1:]
+
+DEFAULT_MODEL_DIR = Path(__file__).parent.parent.parent.parent / 'sdp-model'
+
+# Orçamento de inicialização (tempo total e memória adicionada pela carga)
+STARTUP_BUDGET = {
+    'seconds': float(os.environ.get('SDP_STARTUP_BUDGET_S', 5.0)),
+    'memory_mb': float(os.environ.get('SDP_STARTUP_BUDGET_MB', 512.0)),
+}
+
+# Memória máxima dos modelos por segmento residentes e quantos pré-carregar
+MODEL_POOL_MB = float(os.environ.get('SDP_MODEL_POOL_MB', 256.0))
+PRELOAD_SEGMENTS = int(os.environ.get('SDP_PRELOAD_SEGMENTS', 4))
+
+# Número máximo de pontos avaliados em uma única simulação what-if
+WHATIF_MAX_POINTS = int(os.environ.get('SDP_WHATIF_MAX_POINTS', 250_000))
+
+def rss_mb():
+    """
+    Memória residente (RSS) atual do processo em MB, ou None se indisponível.
+
+    No Linux, lê `/proc/self/statm`. Nos demais sistemas, usa o pico de RSS do
+    `resource` (no Linux ele não serve: um processo filho herda o pico do pai).
+    """
+    statm = Path('/proc/self/statm')
+    if statm.exists():
+        resident_pages = int(statm.read_text().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # No macOS o valor é em bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
 class PerformancePredictionService:
     """
     Serviço para prever a performance educacional de um município.
     """
 
-    def __init__(self):
+    def __init__(self, model_dir=None):
         """
-        Carrega o modelo e o pré-processador a partir dos arquivos salvos.
+        Carrega o modelo a partir dos arquivos salvos, medindo cada fase da inicialização.
+        O custo de memória é a diferença entre o RSS do processo antes e depois da carga.
+
+        Dá preferência ao `inference_model.pkl` (Pipeline do scikit-learn sem o SMOTE),
+        que dispensa o imblearn. Se ele não existir, usa o `champion_model.pkl`.
+
+        Se houver um `segments.json`, cria o pool de modelos por segmento e pré-carrega
+        os segmentos mais usados (histórico em `segment_usage.json`).
         """
-        base_dir = Path(__file__).parent.parent.parent.parent / 'sdp-model'
-        model_path = base_dir / 'champion_model.pkl'
-        preprocessor_path = base_dir / 'preprocessor.pkl'
+        base_dir = Path(model_dir) if model_dir else DEFAULT_MODEL_DIR
+        inference_path = base_dir / 'inference_model.pkl'
+        model_path = inference_path if inference_path.exists() else base_dir / 'champion_model.pkl'
 
         print(f"Carregando modelo de: {model_path}")
-        print(f"Carregando pré-processador de: {preprocessor_path}")
 
-        with open(model_path, 'rb') as f_model:
-            self.model = pickle.load(f_model)
-        
-        with open(preprocessor_path, 'rb') as f_preprocessor:
-            self.preprocessor = pickle.load(f_preprocessor)
+        self.model_path = model_path
+        self.startup_timings = {}
+        self.memory_before_mb = rss_mb()
+        start = time.perf_counter()
+
+        with self._phase('read_artifact'):
+            with open(model_path, 'rb') as f_model:
+                payload = f_model.read()
+
+        # Inclui o import do scikit-learn/numpy disparado pelo unpickling
+        with self._phase('unpickle_model'):
+            self.model = pickle.loads(payload)
+
+        # Limiar nacional do alvo, registrado pela pipeline de modelo
+        results_path = base_dir / 'model_results.json'
+        self.national_threshold = None
+        if results_path.exists():
+            with open(results_path, 'r') as f:
+                self.national_threshold = json.load(f).get('target_threshold')
+
+        with self._phase('preload_segments'):
+            self.pool = ModelPool.from_dir(base_dir, MODEL_POOL_MB)
+            self.usage_path = base_dir / 'segment_usage.json'
+            if self.pool:
+                self.pool.preload(self.pool.most_used(PRELOAD_SEGMENTS, self._read_usage()))
+                atexit.register(self.save_usage)
+
+        # Primeira predição: força os imports tardios (pandas) e caches internos
+        with self._phase('warmup'):
+            self.predict({
+                'PARTIDO': '', 'TX_APROVACAO_5ANO': 0.0,
+                'TX_REPROVACAO_5ANO': 0.0, 'TX_ABANDONO_5ANO': 0.0
+            })
+
+        self.startup_timings['total'] = time.perf_counter() - start
+        self.memory_after_mb = rss_mb()
+        print(f"Inicialização concluída em {self.startup_timings['total']:.3f}s.")
+
+    @contextmanager
+    def _phase(self, name):
+        """Registra a duração de uma fase da inicialização em `startup_timings`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.startup_timings[name] = time.perf_counter() - start
+
+    def _read_usage(self) -> dict:
+        """Lê o histórico de uso dos segmentos, se existir."""
+        if not self.usage_path.exists():
+            return {}
+        with open(self.usage_path, 'r') as f:
+            return json.load(f)
+
+    def save_usage(self):
+        """Acumula o uso dos segmentos desta execução no histórico em disco."""
+        if not self.pool or not self.pool.usage:
+            return
+        usage = self._read_usage()
+        for key, count in self.pool.usage.items():
+            usage[key] = usage.get(key, 0) + count
+        with open(self.usage_path, 'w') as f:
+            json.dump(usage, f, indent=2)
+        self.pool.usage.clear()
+
+    def startup_report(self) -> dict:
+        """
+        Retorna o detalhamento da inicialização por fase e a comparação com o orçamento.
+
+        `memory_mb` traz o RSS do processo antes (`before`) e depois (`after`) da carga
+        e a diferença entre eles (`startup`), comparada com o orçamento.
+        """
+        if self.memory_before_mb is None:
+            memory = None
+        else:
+            memory = {
+                'before': round(self.memory_before_mb, 2),
+                'after': round(self.memory_after_mb, 2),
+                'startup': round(self.memory_after_mb - self.memory_before_mb, 2),
+            }
+        return {
+            'model_path': str(self.model_path),
+            'timings_seconds': {k: round(v, 4) for k, v in self.startup_timings.items()},
+            'memory_mb': memory,
+            'budget': STARTUP_BUDGET,
+            'within_budget': (
+                self.startup_timings['total'] <= STARTUP_BUDGET['seconds']
+                and (memory is None or memory['startup'] <= STARTUP_BUDGET['memory_mb'])
+            ),
+        }
 
     def predict(self, input_data: dict) -> dict:
         """
@@ -33,27 +171,156 @@ class PerformancePredictionService:
                                Ex: {'PARTIDO': 'PSDB', 'TX_APROVACAO_5ANO': 0.8, ...}
 
         Returns:
-            dict: Um dicionário com a predição e o label correspondente.
+            dict: Um dicionário com a predição, o label correspondente, o segmento
+                  cujo modelo foi usado ('nacional' se nenhum modelo de segmento se aplicar)
+                  e o limiar de TX_APROVACAO_9ANO que define "Alta" nesse modelo.
+                  Com `SG_UF`/`NO_REGIAO` e `NU_ANO_CENSO`, usa o modelo do segmento.
         """
-        # Cria um DataFrame a partir do dicionário de entrada
-        df = pd.DataFrame([input_data])
-        
-        # Garante a ordem correta das colunas, conforme o treinamento
-        features = ['PARTIDO', 'TX_APROVACAO_5ANO', 'TX_REPROVACAO_5ANO', 'TX_ABANDONO_5ANO']
-        df = df[features]
+        # Import tardio: o pandas só é necessário quando há uma predição a fazer
+        import pandas as pd
+
+        # Cria um DataFrame a partir do dicionário de entrada,
+        # garantindo a ordem correta das colunas, conforme o treinamento
+        df = pd.DataFrame([{key: input_data[key] for key in FEATURES}], columns=FEATURES)
+
+        segment, model = self._select_model(input_data)
 
         # A predição do pipeline (modelo) já inclui o pré-processamento
-        prediction = self.model.predict(df)
-        prediction_proba = self.model.predict_proba(df)
+        prediction_proba = model.predict_proba(df)
+        prediction = model.classes_[prediction_proba.argmax(axis=1)]
 
         # Mapeia o resultado numérico para um label compreensível
         performance_label = "Alta" if prediction[0] == 1 else "Baixa"
-        
+
         return {
             "prediction": int(prediction[0]),
             "performance_label": performance_label,
+            "segment": segment or "nacional",
+            "threshold": self._threshold(segment),
             "probability": {
-                "baixa": round(prediction_proba[0][0], 4),
-                "alta": round(prediction_proba[0][1], 4)
+                "baixa": round(float(prediction_proba[0][0]), 4),
+                "alta": round(float(prediction_proba[0][1]), 4)
             }
         }
+
+    def whatif(self, base: dict, sweep: list, partidos: list = None) -> dict:
+        """
+        Avalia a probabilidade de performance "Alta" em uma grade de cenários a partir
+        de um registro base, com uma única chamada ao modelo.
+
+        Args:
+            base (dict): Registro base, no mesmo formato da entrada de `predict`.
+            sweep (list): Até duas varreduras sobre taxas, cada uma no formato
+                          {'feature': 'TX_ABANDONO_5ANO', 'start': 0.0, 'stop': 0.1, 'num': 50}
+                          ou {'feature': ..., 'values': [...]}.
+            partidos (list): Valores alternativos de `PARTIDO`, distintos (padrão: o do
+                             registro base). Uma string é tratada como um único partido.
+
+        Returns:
+            dict: Os eixos da grade, a superfície de probabilidade por partido (com shape
+                  igual ao tamanho dos eixos) e os pontos da fronteira de decisão,
+                  interpolados ao longo do último eixo varrido.
+
+        Raises:
+            ValueError: Se a varredura for inválida ou exceder `WHATIF_MAX_POINTS`.
+        """
+        import numpy as np
+        import pandas as pd
+
+        if not isinstance(sweep, list):
+            raise ValueError("'sweep' deve ser uma lista de varreduras.")
+        if len(sweep) > 2:
+            raise ValueError('A varredura aceita no máximo duas features.')
+        # Um único partido pode ser informado como string
+        if isinstance(partidos, str):
+            partidos = [partidos]
+        partidos = partidos if partidos else [base['PARTIDO']]
+        if not isinstance(partidos, list) or not all(isinstance(p, str) for p in partidos):
+            raise ValueError("'PARTIDO' deve ser uma string ou uma lista de strings.")
+        if len(set(partidos)) != len(partidos):
+            raise ValueError("'PARTIDO' não pode conter valores repetidos.")
+
+        axes = {}
+        for spec in sweep:
+            if not isinstance(spec, dict):
+                raise ValueError("Cada varredura deve ser um objeto com a chave 'feature'.")
+            feature = spec.get('feature')
+            if feature not in RATE_FEATURES:
+                raise ValueError(f"Feature de varredura inválida: {feature}. Opções: {RATE_FEATURES}")
+            if feature in axes:
+                raise ValueError(f"Feature repetida na varredura: {feature}")
+            if 'values' in spec:
+                axes[feature] = np.asarray(spec['values'], dtype=float)
+            else:
+                if int(spec['num']) > WHATIF_MAX_POINTS:
+                    raise ValueError(f"A varredura de {feature} excede {WHATIF_MAX_POINTS} pontos.")
+                axes[feature] = np.linspace(float(spec['start']), float(spec['stop']), int(spec['num']))
+            if axes[feature].ndim != 1 or axes[feature].size == 0:
+                raise ValueError(f"A varredura de {feature} deve ter ao menos um valor.")
+
+        shape = (len(partidos),) + tuple(axis.size for axis in axes.values())
+        n_points = int(np.prod(shape))
+        if n_points > WHATIF_MAX_POINTS:
+            raise ValueError(f"A grade tem {n_points} pontos; o máximo é {WHATIF_MAX_POINTS}.")
+
+        # Matriz de candidatos: produto cartesiano entre partidos e eixos varridos
+        grid = np.meshgrid(np.arange(len(partidos)), *axes.values(), indexing='ij')
+        columns = {
+            'PARTIDO': np.asarray(partidos, dtype=object)[grid[0].ravel()],
+        }
+        for feature in RATE_FEATURES:
+            columns[feature] = np.full(n_points, float(base[feature]))
+        for feature, values in zip(axes, grid[1:]):
+            columns[feature] = values.ravel()
+
+        segment, model = self._select_model(base)
+        proba = model.predict_proba(pd.DataFrame(columns, columns=FEATURES))
+        surface = proba[:, list(model.classes_).index(1)].reshape(shape)
+
+        return {
+            'segment': segment or 'nacional',
+            'threshold': self._threshold(segment),
+            'n_points': n_points,
+            'axes': {feature: values.tolist() for feature, values in axes.items()},
+            'partidos': partidos,
+            'probability_alta': {
+                partido: np.round(surface[i], 4).tolist() for i, partido in enumerate(partidos)
+            },
+            'decision_boundary': self._decision_boundary(surface, partidos, axes),
+        }
+
+    @staticmethod
+    def _decision_boundary(surface, partidos, axes):
+        """
+        Encontra onde a probabilidade cruza 0.5 ao longo do último eixo da grade,
+        interpolando linearmente entre os pontos vizinhos.
+        """
+        import numpy as np
+
+        if not axes:
+            return []
+        features = list(axes)
+        last = axes[features[-1]]
+        margin = surface - 0.5
+        crosses = np.signbit(margin[..., :-1]) != np.signbit(margin[..., 1:])
+
+        boundary = []
+        for index in zip(*np.nonzero(crosses)):
+            m0, m1 = margin[index], margin[index[:-1] + (index[-1] + 1,)]
+            x0, x1 = last[index[-1]], last[index[-1] + 1]
+            point = {'PARTIDO': partidos[index[0]]}
+            for feature, position in zip(features[:-1], index[1:-1]):
+                point[feature] = float(axes[feature][position])
+            point[features[-1]] = round(float(x0 + (x1 - x0) * m0 / (m0 - m1)), 6)
+            point['direction'] = 'Baixa->Alta' if m1 > m0 else 'Alta->Baixa'
+            boundary.append(point)
+        return boundary
+
+    def _threshold(self, segment):
+        """Limiar do alvo do modelo usado: o do segmento ou o nacional."""
+        return self.pool.threshold(segment) if segment else self.national_threshold
+
+    def _select_model(self, input_data: dict):
+        """Roteia para o modelo do segmento, se houver; caso contrário, usa o nacional."""
+        segment = self.pool.resolve(input_data) if self.pool else None
+        return segment, (self.pool.get(segment) if segment else self.model)
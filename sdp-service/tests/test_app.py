@@ -40,6 +40,134 @@ class TestPerformancePredictionAPI(unittest.TestCase):
         self.assertIsInstance(response_data['performance_label'], str, msg="O valor de 'performance_label' deve ser uma string")
         self.assertIsInstance(response_data['probability']['baixa'], float, msg="A probabilidade 'baixa' deve ser um float")
 
+    def test_predict_segment(self):
+        """Testa se a predição informa o segmento e o limiar do modelo usado (roteamento em test_model_pool)."""
+        input_data = {
+            "PARTIDO": "PT",
+            "TX_APROVACAO_5ANO": 0.90,
+            "TX_REPROVACAO_5ANO": 0.08,
+            "TX_ABANDONO_5ANO": 0.02,
+            "SG_UF": "CE",
+            "NU_ANO_CENSO": 2023
+        }
+
+        response = self.client.post('/predict',
+                                    data=json.dumps(input_data),
+                                    content_type='application/json')
+
+        self.assertEqual(response.status_code, 200, msg="Endpoint de predição deve retornar 200 OK para dados com segmento")
+        response_data = response.get_json()
+        self.assertIn('segment', response_data, msg="A resposta deve conter a chave 'segment'")
+        self.assertIn('threshold', response_data, msg="A resposta deve conter o limiar aplicado")
+
+    def test_whatif_grid(self):
+        """Testa a simulação what-if com uma grade 2-D de 10.000 pontos."""
+        input_data = {
+            "base": {
+                "PARTIDO": "PSDB",
+                "TX_APROVACAO_5ANO": 0.85,
+                "TX_REPROVACAO_5ANO": 0.10,
+                "TX_ABANDONO_5ANO": 0.05
+            },
+            "sweep": [
+                {"feature": "TX_APROVACAO_5ANO", "start": 0.5, "stop": 1.0, "num": 100},
+                {"feature": "TX_ABANDONO_5ANO", "start": 0.0, "stop": 0.2, "num": 100}
+            ]
+        }
+
+        response = self.client.post('/whatif',
+                                    data=json.dumps(input_data),
+                                    content_type='application/json')
+
+        self.assertEqual(response.status_code, 200, msg="Endpoint what-if deve retornar 200 OK para uma varredura válida")
+        response_data = response.get_json()
+        self.assertEqual(response_data['n_points'], 10000, msg="A grade deve ter 100 x 100 pontos")
+        surface = response_data['probability_alta']['PSDB']
+        self.assertEqual((len(surface), len(surface[0])), (100, 100), msg="A superfície deve ter o shape dos eixos")
+        self.assertIn('decision_boundary', response_data, msg="A resposta deve conter a fronteira de decisão")
+
+    def test_whatif_partidos(self):
+        """Testa a simulação what-if com valores alternativos de PARTIDO."""
+        input_data = {
+            "base": {
+                "PARTIDO": "PT",
+                "TX_APROVACAO_5ANO": 0.85,
+                "TX_REPROVACAO_5ANO": 0.10,
+                "TX_ABANDONO_5ANO": 0.05
+            },
+            "sweep": [{"feature": "TX_ABANDONO_5ANO", "values": [0.0, 0.05, 0.1]}],
+            "PARTIDO": ["PT", "MDB"]
+        }
+
+        response = self.client.post('/whatif',
+                                    data=json.dumps(input_data),
+                                    content_type='application/json')
+
+        self.assertEqual(response.status_code, 200, msg="Endpoint what-if deve retornar 200 OK para partidos alternativos")
+        response_data = response.get_json()
+        self.assertEqual(set(response_data['probability_alta']), {'PT', 'MDB'}, msg="Deve haver uma curva por partido")
+        self.assertEqual(len(response_data['probability_alta']['MDB']), 3, msg="Cada curva deve ter um ponto por valor varrido")
+
+    def test_whatif_invalid_feature(self):
+        """Testa se a simulação what-if rejeita features que não são taxas."""
+        input_data = {
+            "base": {
+                "PARTIDO": "PT",
+                "TX_APROVACAO_5ANO": 0.85,
+                "TX_REPROVACAO_5ANO": 0.10,
+                "TX_ABANDONO_5ANO": 0.05
+            },
+            "sweep": [{"feature": "PARTIDO", "values": [0.1]}]
+        }
+
+        response = self.client.post('/whatif',
+                                    data=json.dumps(input_data),
+                                    content_type='application/json')
+
+        self.assertEqual(response.status_code, 400, msg="API deve retornar 400 Bad Request para varredura inválida")
+        self.assertIn('Varredura inválida', response.get_json()['error'], msg="A mensagem de erro deve indicar a varredura inválida")
+
+    def test_whatif_single_partido_string(self):
+        """Testa se um PARTIDO informado como string é tratado como um único partido."""
+        input_data = {
+            "base": {
+                "PARTIDO": "PT",
+                "TX_APROVACAO_5ANO": 0.85,
+                "TX_REPROVACAO_5ANO": 0.10,
+                "TX_ABANDONO_5ANO": 0.05
+            },
+            "PARTIDO": "PSDB"
+        }
+
+        response = self.client.post('/whatif',
+                                    data=json.dumps(input_data),
+                                    content_type='application/json')
+
+        self.assertEqual(response.status_code, 200, msg="Endpoint what-if deve aceitar um único partido como string")
+        self.assertEqual(response.get_json()['partidos'], ['PSDB'], msg="A string não deve ser dividida em caracteres")
+
+    def test_whatif_malformed_payloads(self):
+        """Testa se payloads com tipos inválidos retornam 400 em vez de 500."""
+        base = {
+            "PARTIDO": "PT",
+            "TX_APROVACAO_5ANO": 0.85,
+            "TX_REPROVACAO_5ANO": 0.10,
+            "TX_ABANDONO_5ANO": 0.05
+        }
+        payloads = [
+            [base],
+            {"base": ["PT"], "PARTIDO": ["PT"]},
+            {"base": base, "sweep": ["x"]},
+            {"base": base, "sweep": {"feature": "TX_ABANDONO_5ANO", "values": [0.1]}},
+            {"base": base, "PARTIDO": ["PT", 1]},
+            {"base": base, "PARTIDO": ["PT", "PT"]},
+        ]
+        for payload in payloads:
+            response = self.client.post('/whatif',
+                                        data=json.dumps(payload),
+                                        content_type='application/json')
+            self.assertEqual(response.status_code, 400, msg=f"Payload inválido deve retornar 400: {payload}")
+
     def test_predict_missing_data(self):
         """Testa o endpoint de predição com dados de entrada incompletos."""
         input_data = {"PARTIDO": "MDB"}
@@ -0,0 +1,178 @@
+import unittest
+import json
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+from sdp.model_pool import ModelPool
+
+def criar_pool(tmp_dir, max_memory_mb):
+    """Cria um pool com três segmentos fictícios de ~1 MB cada."""
+    segments = {}
+    for uf, n_samples in [('CE', 100), ('SP', 300), ('BA', 200)]:
+        key = f"SG_UF={uf}__NU_ANO_CENSO=2023"
+        path = Path(tmp_dir) / f"{key}.pkl"
+        with open(path, 'wb') as f:
+            pickle.dump({'uf': uf, 'payload': b'0' * (1024 * 1024)}, f)
+        segments[key] = {'path': path.name, 'threshold': 0.5, 'n_samples': n_samples}
+    manifest = {'levels': [['SG_UF', 'NU_ANO_CENSO']], 'segments': segments}
+    return ModelPool(tmp_dir, manifest, max_memory_mb)
+
+class TestModelPool(unittest.TestCase):
+    def setUp(self):
+        """Cria um diretório temporário para os modelos fictícios."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_resolve(self):
+        """Testa o roteamento da requisição para a chave do segmento."""
+        pool = criar_pool(self.tmp.name, max_memory_mb=10)
+        self.assertEqual(pool.resolve({'SG_UF': 'CE', 'NU_ANO_CENSO': 2023}), 'SG_UF=CE__NU_ANO_CENSO=2023')
+        self.assertIsNone(pool.resolve({'SG_UF': 'RS', 'NU_ANO_CENSO': 2023}), msg="Segmento sem modelo deve retornar None")
+        self.assertIsNone(pool.resolve({'SG_UF': 'CE'}), msg="Requisição sem o ano deve retornar None")
+
+    def test_lazy_loading_and_hits(self):
+        """Testa se o modelo só é carregado no primeiro uso e depois reaproveitado."""
+        pool = criar_pool(self.tmp.name, max_memory_mb=10)
+        self.assertEqual(pool.stats()['resident'], [], msg="Nenhum modelo deve ser carregado na criação do pool")
+
+        key = 'SG_UF=CE__NU_ANO_CENSO=2023'
+        self.assertEqual(pool.get(key)['uf'], 'CE')
+        pool.get(key)
+        stats = pool.stats()
+        self.assertEqual((stats['misses'], stats['hits']), (1, 1))
+        self.assertEqual(stats['usage'], {key: 2})
+
+    def test_lru_eviction_respects_memory_limit(self):
+        """Testa se o modelo menos usado recentemente é descarregado ao exceder o limite."""
+        pool = criar_pool(self.tmp.name, max_memory_mb=2.5)
+        pool.get('SG_UF=CE__NU_ANO_CENSO=2023')
+        pool.get('SG_UF=SP__NU_ANO_CENSO=2023')
+        pool.get('SG_UF=CE__NU_ANO_CENSO=2023')
+        pool.get('SG_UF=BA__NU_ANO_CENSO=2023')
+
+        stats = pool.stats()
+        self.assertEqual(stats['resident'], ['SG_UF=CE__NU_ANO_CENSO=2023', 'SG_UF=BA__NU_ANO_CENSO=2023'])
+        self.assertEqual(stats['evictions'], 1)
+        self.assertLessEqual(stats['memory_mb'], stats['max_memory_mb'])
+
+    def test_preload_most_used(self):
+        """Testa o pré-carregamento pelos segmentos mais usados (ou maiores, sem histórico)."""
+        pool = criar_pool(self.tmp.name, max_memory_mb=10)
+        self.assertEqual(pool.most_used(1), ['SG_UF=SP__NU_ANO_CENSO=2023'])
+        self.assertEqual(pool.most_used(1, {'SG_UF=BA__NU_ANO_CENSO=2023': 5}), ['SG_UF=BA__NU_ANO_CENSO=2023'])
+
+        pool.preload(pool.most_used(2))
+        self.assertEqual(pool.stats()['resident'], ['SG_UF=SP__NU_ANO_CENSO=2023', 'SG_UF=BA__NU_ANO_CENSO=2023'])
+
+    def test_cold_load_does_not_block_hits(self):
+        """Testa se a leitura de um segmento frio não bloqueia os modelos já residentes."""
+        pool = criar_pool(self.tmp.name, max_memory_mb=10)
+        pool.get('SG_UF=CE__NU_ANO_CENSO=2023')
+
+        reading, release = threading.Event(), threading.Event()
+        original_read = pool._read
+
+        def slow_read(key):
+            reading.set()
+            release.wait(timeout=5)
+            return original_read(key)
+
+        pool._read = slow_read
+        cold = threading.Thread(target=pool.get, args=('SG_UF=SP__NU_ANO_CENSO=2023',))
+        cold.start()
+        reading.wait(timeout=5)
+
+        hit = threading.Thread(target=pool.get, args=('SG_UF=CE__NU_ANO_CENSO=2023',))
+        hit.start()
+        hit.join(timeout=2)
+        self.assertFalse(hit.is_alive(), msg="Um acerto no pool não deve esperar a carga de outro segmento")
+
+        release.set()
+        cold.join(timeout=5)
+        self.assertIn('SG_UF=SP__NU_ANO_CENSO=2023', pool.stats()['resident'])
+
+class TestSegmentRouting(unittest.TestCase):
+    """Testa o roteamento de ponta a ponta em um diretório de modelos temporário."""
+
+    FEATURES = ['PARTIDO', 'TX_APROVACAO_5ANO', 'TX_REPROVACAO_5ANO', 'TX_ABANDONO_5ANO']
+    SEGMENTS = {
+        'SG_UF=CE__NU_ANO_CENSO=2023': 0.7,
+        'NO_REGIAO=Nordeste__NU_ANO_CENSO=2023': 0.6,
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        """Cria um modelo nacional e dois modelos de segmento mínimos."""
+        import pandas as pd
+        from sklearn.compose import ColumnTransformer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import OneHotEncoder
+        from sdp.service import PerformancePredictionService
+
+        cls.tmp = tempfile.TemporaryDirectory()
+        model_dir = Path(cls.tmp.name)
+        X = pd.DataFrame({
+            'PARTIDO': ['PT', 'PSDB', 'MDB', 'PT'],
+            'TX_APROVACAO_5ANO': [0.7, 0.8, 0.9, 0.95],
+            'TX_REPROVACAO_5ANO': [0.25, 0.15, 0.08, 0.04],
+            'TX_ABANDONO_5ANO': [0.05, 0.05, 0.02, 0.01],
+        })
+
+        def salvar_modelo(path):
+            model = Pipeline([
+                ('preprocessor', ColumnTransformer(
+                    [('cat', OneHotEncoder(handle_unknown='ignore'), ['PARTIDO'])], remainder='passthrough')),
+                ('classifier', LogisticRegression()),
+            ]).fit(X, [0, 0, 1, 1])
+            path.parent.mkdir(exist_ok=True)
+            with open(path, 'wb') as f:
+                pickle.dump(model, f)
+
+        salvar_modelo(model_dir / 'inference_model.pkl')
+        segments = {}
+        for key, threshold in cls.SEGMENTS.items():
+            salvar_modelo(model_dir / 'segments' / f"{key}.pkl")
+            segments[key] = {'path': f"segments/{key}.pkl", 'threshold': threshold, 'n_samples': 4}
+        with open(model_dir / 'segments.json', 'w') as f:
+            json.dump({'levels': [['SG_UF', 'NU_ANO_CENSO'], ['NO_REGIAO', 'NU_ANO_CENSO']],
+                       'segments': segments}, f)
+        with open(model_dir / 'model_results.json', 'w') as f:
+            json.dump({'target_threshold': 0.5}, f)
+
+        cls.service = PerformancePredictionService(model_dir=model_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Descarta o uso acumulado (o diretório temporário não existirá no atexit)."""
+        cls.service.pool.usage.clear()
+        cls.tmp.cleanup()
+
+    def predict(self, **segment_fields):
+        """Faz uma predição com o registro base e os campos de segmento informados."""
+        input_data = {'PARTIDO': 'PT', 'TX_APROVACAO_5ANO': 0.85,
+                      'TX_REPROVACAO_5ANO': 0.10, 'TX_ABANDONO_5ANO': 0.05}
+        return self.service.predict(dict(input_data, **segment_fields))
+
+    def test_routes_to_uf_segment(self):
+        """Testa se a UF tem precedência sobre a região."""
+        result = self.predict(SG_UF='CE', NO_REGIAO='Nordeste', NU_ANO_CENSO=2023)
+        self.assertEqual(result['segment'], 'SG_UF=CE__NU_ANO_CENSO=2023')
+        self.assertEqual(result['threshold'], 0.7, msg="Deve informar o limiar do segmento")
+
+    def test_falls_back_to_region(self):
+        """Testa se uma UF sem modelo recai no modelo da região."""
+        result = self.predict(SG_UF='BA', NO_REGIAO='Nordeste', NU_ANO_CENSO=2023)
+        self.assertEqual(result['segment'], 'NO_REGIAO=Nordeste__NU_ANO_CENSO=2023')
+        self.assertEqual(result['threshold'], 0.6)
+
+    def test_falls_back_to_national(self):
+        """Testa se, sem segmento aplicável, o modelo nacional é usado."""
+        for fields in ({}, {'SG_UF': 'CE'}, {'SG_UF': 'SP', 'NO_REGIAO': 'Sudeste', 'NU_ANO_CENSO': 2023}):
+            result = self.predict(**fields)
+            self.assertEqual(result['segment'], 'nacional', msg=f"Campos {fields} devem usar o modelo nacional")
+            self.assertEqual(result['threshold'], 0.5, msg="Deve informar o limiar nacional")
+
+if __name__ == '__main__':
+    unittest.main()
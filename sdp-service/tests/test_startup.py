@@ -0,0 +1,72 @@
+import unittest
+import subprocess
+import sys
+import json
+
+def run_python(code):
+    """Executa um trecho de código em um interpretador novo e retorna o JSON impresso."""
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+class TestServiceStartup(unittest.TestCase):
+    def test_import_is_lazy(self):
+        """Testa se importar o app não carrega as dependências pesadas."""
+        loaded = run_python(
+            "import sys, json; import sdp.app; "
+            "print(json.dumps([m for m in ('pandas', 'sklearn', 'imblearn') if m in sys.modules]))"
+        )
+        self.assertEqual(loaded, [], msg="Importar sdp.app não deve importar pandas, sklearn ou imblearn")
+
+    def test_inference_does_not_need_imblearn(self):
+        """Testa se o serviço carrega o modelo sem importar o imblearn."""
+        loaded = run_python(
+            "import sys, json; from sdp.app import get_service; get_service(); "
+            "print(json.dumps('imblearn' in sys.modules))"
+        )
+        self.assertFalse(loaded, msg="O artefato de inferência não deve depender do imblearn")
+
+    def test_concurrent_first_requests_initialize_once(self):
+        """Testa se requisições simultâneas inicializam o serviço uma única vez."""
+        created = run_python(
+            "import json, threading; import sdp.service; from sdp import app as app_module\n"
+            "count = []\n"
+            "original = sdp.service.PerformancePredictionService.__init__\n"
+            "def init(self, *a, **k):\n"
+            "    count.append(1); original(self, *a, **k)\n"
+            "sdp.service.PerformancePredictionService.__init__ = init\n"
+            "threads = [threading.Thread(target=app_module.get_service) for _ in range(8)]\n"
+            "[t.start() for t in threads]; [t.join() for t in threads]\n"
+            "print(json.dumps(len(count)))"
+        )
+        self.assertEqual(created, 1, msg="O serviço deve ser construído uma única vez")
+
+    def test_import_error_is_reported(self):
+        """Testa se uma falha no import do serviço é registrada em vez de virar um erro 500."""
+        result = run_python(
+            "import sys, json; sys.modules['sdp.service'] = None; from sdp.app import app\n"
+            "response = app.test_client().post('/predict', json={})\n"
+            "print(json.dumps([response.status_code, response.get_json()['detail'] is not None]))"
+        )
+        self.assertEqual(result, [503, True], msg="Falha no import deve retornar 503 com o detalhe do erro")
+
+    def test_startup_report_within_budget(self):
+        """Testa o relatório de inicialização e o orçamento de tempo e memória."""
+        # Interpretador novo: o tempo e a memória não incluem o que outros testes já carregaram
+        report = run_python(
+            "import json; from sdp.app import app\n"
+            "response = app.test_client().get('/startup')\n"
+            "print(json.dumps([response.status_code, response.get_json()]))"
+        )
+        status, report = report
+        self.assertEqual(status, 200, msg="Endpoint de inicialização deve retornar 200 OK")
+
+        for phase in ('read_artifact', 'unpickle_model', 'preload_segments', 'warmup', 'total'):
+            self.assertIn(phase, report['timings_seconds'], msg=f"O relatório deve conter a fase '{phase}'")
+        memory = report['memory_mb']
+        if memory is not None:
+            self.assertAlmostEqual(memory['startup'], memory['after'] - memory['before'], places=1)
+            self.assertGreater(memory['startup'], 0, msg="A carga do modelo deve aumentar a memória residente")
+        self.assertTrue(report['within_budget'], msg=f"Inicialização fora do orçamento: {report}")
+
+if __name__ == '__main__':
+    unittest.main()